@@ -1,153 +1,328 @@
-import time
-import json
 import csv
 import os
+import atexit
 import logging
-from datetime import datetime
+from functools import lru_cache
 from selenium import webdriver
 from selenium.webdriver.firefox.service import Service
 from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.firefox import GeckoDriverManager
-from bs4 import BeautifulSoup
-
-# Set up logging
-log_directory = "logs"
-os.makedirs(log_directory, exist_ok=True)
-log_file = os.path.join(log_directory, f"menu_scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve as sv
+import orjson
+import requests
+from tenacity import (
+    retry,
+    retry_if_exception,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
 )
+# Importing scraper_common also sets up logging for the run
+from scraper_common import (
+    SCROLL_TO_BOTTOM_FN,
+    WAIT_FOR_SELECTOR_FN,
+    cached_driver_path,
+    clear_browser_state,
+    has_class,
+    load_cached_rows,
+    select_text,
+    store_cached_rows,
+)
+
 logger = logging.getLogger(__name__)
 
-def scroll_to_bottom(driver, pause_time=1.0):
-    """Scroll to the bottom of the page to ensure all dynamic content is loaded."""
-    last_height = driver.execute_script("return document.body.scrollHeight")
+@lru_cache(maxsize=1)
+def get_gecko_driver_path():
+    """Resolve the GeckoDriver binary, reusing the path cached on disk for up to a week"""
+    return cached_driver_path("geckodriver_path", lambda: GeckoDriverManager().install())
+
+# The shared in-page helpers are combined into the script below so a whole page can be
+# handled in one WebDriver round trip.
+# extractMenu builds the A&W menu rows inside the browser. It walks each category
+# container once; on pages without containers, each link in the category menu names
+# a category whose items are found under the matching CSS class.
+EXTRACT_MENU_FN = """
+const extractMenu = (menuSelector, itemSelector) => {
+    const text = (root, selector) => {
+        const el = root.querySelector(selector);
+        return el ? el.textContent.trim() : null;
+    };
+    const toRow = (item, category) => {
+        let imageUrl = "";
+        const img = item.querySelector("img");
+        if (img && img.getAttribute("src")) {
+            imageUrl = img.getAttribute("src");
+            if (imageUrl.startsWith("/")) {
+                imageUrl = "https://web.aw.ca" + imageUrl;
+            }
+        }
+        return {
+            restaurant: "A&W",
+            category: category,
+            name: text(item, ".item-name h3") ?? "Unknown",
+            price: text(item, ".item-price") ?? "Price not available online",
+            description: text(item, ".item-description") ?? "",
+            image_url: imageUrl
+        };
+    };
+    const rows = [];
+    const blocks = document.querySelectorAll(".category-block");
+    if (blocks.length) {
+        for (const block of blocks) {
+            const category = text(block, ".category-title") ?? "Uncategorized";
+            for (const item of block.querySelectorAll(itemSelector)) {
+                rows.push(toRow(item, category));
+            }
+        }
+        return rows;
+    }
+    for (const link of document.querySelectorAll(`${menuSelector} a`)) {
+        const category = link.textContent.trim();
+        const categoryClass = category.replace(/ /g, "-").replace(/&/g, "and").replace(/'/g, "").toLowerCase();
+        for (const item of document.querySelectorAll(`.${CSS.escape(categoryClass)} ${itemSelector}`)) {
+            rows.push(toRow(item, category));
+        }
+    }
+    return rows;
+};
+"""
+
+# Waits for the category menu, scrolls to load all of it and extracts the rows, resolving
+# with null if the menu never appeared. Arguments: category menu selector, item selector,
+# wait timeout in ms, scroll debounce in ms, scroll cap in ms, then the async callback.
+WAIT_AND_EXTRACT_JS = WAIT_FOR_SELECTOR_FN + SCROLL_TO_BOTTOM_FN + EXTRACT_MENU_FN + """
+const [menuSelector, itemSelector, timeoutMs, debounceMs, maxWaitMs, done] = arguments;
+waitForSelector(menuSelector, timeoutMs)
+    .then(found => found ? scrollToBottom(debounceMs, maxWaitMs).then(() => extractMenu(menuSelector, itemSelector)) : null)
+    .then(done, () => done(null));
+"""
+
+# CSS selectors for the BeautifulSoup fallback, compiled once and reused for every item
+SEL_CATEGORY_BLOCK = sv.compile(".category-block")
+SEL_CATEGORY_TITLE = sv.compile(".category-title")
+SEL_CATEGORY_LINKS = sv.compile(".category-menu a")
+SEL_ITEM = sv.compile(".item")
+SEL_ITEM_NAME = sv.compile(".item-name h3")
+SEL_ITEM_DESCRIPTION = sv.compile(".item-description")
+SEL_ITEM_PRICE = sv.compile(".item-price")
+SEL_IMAGE = sv.compile("img")
+
+# Only the category containers are built into the parse tree; the rest of the page
+# (navigation, scripts, footers) is skipped as it is parsed
+STRAIN_CATEGORY_BLOCKS = SoupStrainer(attrs={"class": has_class("category-block")})
+
+def parse_aw_item(item, category):
+    """Build a menu row from one A&W item element"""
+    item_name = select_text(item, SEL_ITEM_NAME, "Unknown")
+    
+    # Extract item description
+    item_description = select_text(item, SEL_ITEM_DESCRIPTION, "")
+    
+    # Extract price
+    item_price = select_text(item, SEL_ITEM_PRICE, "Price not available online")
+    
+    # Extract image URL
+    item_image = ""
+    img_tag = SEL_IMAGE.select_one(item)
+    if img_tag and img_tag.get('src'):
+        item_image = img_tag.get('src')
+        if item_image.startswith('/'):
+            item_image = f"https://web.aw.ca{item_image}"
+    
+    return {
+        "restaurant": "A&W",
+        "category": category,
+        "name": item_name,
+        "price": item_price,
+        "description": item_description,
+        "image_url": item_image
+    }
+
+def parse_aw_menu(page_source):
+    """Parse A&W menu items from the page source with BeautifulSoup"""
+    menu_data = []
+    
+    # Only try the category container layout when the page can contain it, so pages in
+    # the link layout are parsed once. Pages with containers only need those subtrees built.
+    if 'category-block' in page_source:
+        soup = BeautifulSoup(page_source, 'lxml', parse_only=STRAIN_CATEGORY_BLOCKS)
+        
+        # Walk each category container once, collecting the items inside it
+        category_blocks = SEL_CATEGORY_BLOCK.select(soup)
+        if category_blocks:
+            logger.info(f"Found {len(category_blocks)} menu categories")
+            for block in category_blocks:
+                category = select_text(block, SEL_CATEGORY_TITLE, "Uncategorized")
+                logger.debug(f"Processing category: {category}")
+                for item in SEL_ITEM.select(block):
+                    menu_data.append(parse_aw_item(item, category))
+            return menu_data
+    
+    # Without category containers, match each category menu link to its CSS class.
+    # The classes are only known once the menu is read, so this needs the full page.
+    soup = BeautifulSoup(page_source, 'lxml')
+    category_menu = SEL_CATEGORY_LINKS.select(soup)
+    menu_categories = [category.get_text(strip=True) for category in category_menu]
+    logger.info(f"Found {len(menu_categories)} menu categories: {menu_categories}")
+    
+    for category in menu_categories:
+        logger.debug(f"Processing category: {category}")
+        category_class = category.replace(' ', '-').replace('&', 'and').replace("'", "").lower()
+        for item in soup.select(f".{category_class} .item"):
+            menu_data.append(parse_aw_item(item, category))
+    
+    return menu_data
+
+@lru_cache(maxsize=1)
+def _get_driver():
+    """Create the Firefox WebDriver shared by every scrape in this process"""
+    # Configure Firefox options
+    options = Options()
+    options.add_argument("--headless")  # Headless mode
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    
+    # Skip downloading images and stylesheets; the scraper only reads the DOM,
+    # and image URLs are still available from the src attributes
+    options.set_preference("permissions.default.image", 2)
+    options.set_preference("permissions.default.stylesheet", 2)
+    options.set_preference("dom.webnotifications.enabled", False)
+    
+    # Use WebDriver Manager to get the correct GeckoDriver version
+    service = Service(get_gecko_driver_path())
+    driver = webdriver.Firefox(service=service, options=options)
+    
+    logger.info("WebDriver successfully initialized with the correct GeckoDriver version")
+    return driver
+
+def close_driver():
+    """Quit the shared WebDriver, if one was started"""
+    if _get_driver.cache_info().currsize:
+        try:
+            _get_driver().quit()
+            logger.info("WebDriver closed")
+        except WebDriverException as e:
+            logger.warning(f"Error closing WebDriver: {str(e)}")
+        _get_driver.cache_clear()
+
+atexit.register(close_driver)
+
+MAX_RETRIES = 3
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"
+
+# Firefox does not expose the document's HTTP status to scripts, so it is checked
+# with a HEAD request. These answers say nothing about what the browser will get:
+# the server does not support HEAD, or a bot filter is turning away a non-browser client.
+INCONCLUSIVE_STATUSES = (401, 403, 405, 501)
+# Client errors that are transient, like server errors, and worth retrying
+RETRYABLE_STATUSES = (408, 429)
+
+class MenuPageError(Exception):
+    """The menu page answered with an HTTP error status"""
     
-    while True:
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(pause_time)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
+    def __init__(self, status):
+        super().__init__(f"Menu page returned HTTP {status}")
+        self.status = status
+
+def check_page_status(url):
+    """Raise MenuPageError if the page answers a HEAD request with an HTTP error status"""
+    response = requests.head(url, headers={"User-Agent": USER_AGENT}, allow_redirects=True, timeout=10)
+    if response.status_code in INCONCLUSIVE_STATUSES:
+        logger.info(f"HEAD request got HTTP {response.status_code}, checking the page in the browser")
+    elif response.status_code >= 400:
+        raise MenuPageError(response.status_code)
+
+def _is_transient_status(e):
+    """5xx, 408 and 429 responses are worth retrying; other 4xx responses will not change on retry"""
+    return isinstance(e, MenuPageError) and (e.status >= 500 or e.status in RETRYABLE_STATUSES)
+
+def _before_retry(retry_state):
+    """Log a failed attempt and drop the browser if it failed for a reason other than a timeout"""
+    e = retry_state.outcome.exception()
+    logger.error(f"Error scraping A&W menu: {str(e)}")
+    if isinstance(e, WebDriverException) and not isinstance(e, TimeoutException):
+        # The browser may be in a bad state, so start a fresh one on the next attempt
+        close_driver()
+    logger.info(f"Retrying... ({retry_state.attempt_number}/{MAX_RETRIES})")
+
+@retry(
+    stop=stop_after_attempt(MAX_RETRIES),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    retry=(
+        retry_if_exception_type((TimeoutException, WebDriverException, requests.RequestException))
+        | retry_if_exception(_is_transient_status)
+    ),
+    before_sleep=_before_retry,
+    reraise=True,
+)
+def _scrape_aw_once(menu_url):
+    """Make one attempt at scraping the A&W menu, from the page cache or the browser"""
+    # Reuse recently scraped rows if there are any
+    menu_data = load_cached_rows(menu_url)
+    if menu_data:
+        logger.info("Loaded A&W menu from the cache")
+        return menu_data
+    
+    # Fail fast on error statuses before starting or driving the browser
+    check_page_status(menu_url)
+    
+    # Reuse the browser from earlier attempts and calls, starting from a clean state
+    driver = _get_driver()
+    clear_browser_state(driver)
+    driver.get(menu_url)
+    
+    # Wait for the menu, scroll to load all content and extract it in a single browser call
+    menu_data = driver.execute_async_script(WAIT_AND_EXTRACT_JS, ".category-menu", ".item", 20000, 300, 5000)
+    if menu_data is None:
+        raise TimeoutException("Menu page did not load within 20 seconds")
+    logger.info("Menu page loaded successfully")
+    
+    if not menu_data:
+        # Fall back to parsing the page source with BeautifulSoup
+        menu_data = parse_aw_menu(driver.page_source)
+    
+    # Cache the rows so retries and later runs can skip the browser
+    if menu_data:
+        store_cached_rows(menu_url, menu_data)
+    return menu_data
 
 def scrape_aw_menu():
     """Scrape A&W menu using Selenium with WebDriver Manager for Firefox"""
     logger.info("Starting A&W menu scraping")
     menu_url = "https://web.aw.ca/en/our-menu"
 
-    # Retry logic for scraping
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            # Configure Firefox options
-            options = Options()
-            options.add_argument("--headless")  # Headless mode
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--window-size=1920,1080")
-            
-            # Use WebDriver Manager to get the correct GeckoDriver version
-            service = Service(GeckoDriverManager().install())
-            driver = webdriver.Firefox(service=service, options=options)
-            
-            logger.info("WebDriver successfully initialized with the correct GeckoDriver version")
-            driver.get(menu_url)
-            
-            # Wait for the page to fully load
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".category-menu"))
-            )
-            logger.info("Menu page loaded successfully")
-            
-            # Scroll to the bottom to load all dynamic content
-            scroll_to_bottom(driver)
-            
-            # Get page source and parse it with BeautifulSoup
-            page_source = driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Extract menu categories
-            category_menu = soup.select('.category-menu a')
-            menu_categories = [category.get_text(strip=True) for category in category_menu]
-            logger.info(f"Found {len(menu_categories)} menu categories: {menu_categories}")
+    try:
+        # Transient failures are retried with exponential backoff inside _scrape_aw_once
+        menu_data = _scrape_aw_once(menu_url)
+        logger.info(f"Scraped {len(menu_data)} items from A&W menu")
+        
+        # Save data
+        if menu_data:
+            os.makedirs("menu_data", exist_ok=True)
             
-            # Extract menu items for each category
-            menu_data = []
-            for category in menu_categories:
-                logger.info(f"Processing category: {category}")
-                category_class = category.replace(' ', '-').replace('&', 'and').replace("'", "").lower()
-                category_items = soup.select(f".{category_class} .item")
-                for item in category_items:
-                    item_name_elem = item.select_one(".item-name h3")
-                    item_name = item_name_elem.get_text(strip=True) if item_name_elem else "Unknown"
-                    
-                    # Extract item description
-                    item_desc_elem = item.select_one(".item-description")
-                    item_description = item_desc_elem.get_text(strip=True) if item_desc_elem else ""
-                    
-                    # Extract price
-                    item_price_elem = item.select_one(".item-price")
-                    item_price = item_price_elem.get_text(strip=True) if item_price_elem else "Price not available online"
-                    
-                    # Extract image URL
-                    item_image = ""
-                    img_tag = item.select_one("img")
-                    if img_tag and img_tag.get('src'):
-                        item_image = img_tag.get('src')
-                        if item_image.startswith('/'):
-                            item_image = f"https://web.aw.ca{item_image}"
-                    
-                    menu_data.append({
-                        "restaurant": "A&W",
-                        "category": category,
-                        "name": item_name,
-                        "price": item_price,
-                        "description": item_description,
-                        "image_url": item_image
-                    })
+            # Save as JSON
+            with open("menu_data/aw_menu.json", 'wb') as json_file:
+                json_file.write(orjson.dumps(menu_data, option=orjson.OPT_INDENT_2))
             
-            logger.info(f"Scraped {len(menu_data)} items from A&W menu")
+            # Save as CSV
+            with open("menu_data/aw_menu.csv", 'w', newline='', encoding='utf-8') as csv_file:
+                fieldnames = list(menu_data[0])
+                writer = csv.writer(csv_file)
+                writer.writerow(fieldnames)
+                writer.writerows([item[field] for field in fieldnames] for item in menu_data)
             
-            # Close the browser
-            driver.quit()
+            logger.info("Menu data saved to menu_data/aw_menu.json and menu_data/aw_menu.csv")
             
-            # Save data
-            if menu_data:
-                os.makedirs("menu_data", exist_ok=True)
-                
-                # Save as JSON
-                with open("menu_data/aw_menu.json", 'w', encoding='utf-8') as json_file:
-                    json.dump(menu_data, json_file, indent=4, ensure_ascii=False)
-                
-                # Save as CSV
-                with open("menu_data/aw_menu.csv", 'w', newline='', encoding='utf-8') as csv_file:
-                    fieldnames = menu_data[0].keys()
-                    writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(menu_data)
-                
-                logger.info("Menu data saved to menu_data/aw_menu.json and menu_data/aw_menu.csv")
-                
-            return menu_data
-        
-        except Exception as e:
-            logger.error(f"Error scraping A&W menu: {str(e)}")
-            if attempt < max_retries - 1:
-                logger.info(f"Retrying... ({attempt + 1}/{max_retries})")
-                time.sleep(5)  # Wait before retrying
-            else:
-                logger.error("Max retries reached. Exiting.")
-                return []
+        return menu_data
+    
+    except Exception as e:
+        logger.error(f"Error scraping A&W menu: {str(e)}")
+        logger.error("Giving up on the A&W menu.")
+        return []
 
 # Run the scraper directly if executed as a script
 if __name__ == "__main__":
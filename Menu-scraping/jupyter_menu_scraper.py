@@ -1,94 +1,461 @@
 import requests
-from bs4 import BeautifulSoup
-import json
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve as sv
 import csv
 import time
-import random
+import re
 import sys
 import argparse
+import asyncio
+import queue
+import threading
+import httpx
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 import os
+import base64
 import logging
-import subprocess
-from datetime import datetime
+import shutil
+from functools import lru_cache
+# Importing scraper_common also sets up logging for the run
+from scraper_common import (
+    SCROLL_TO_BOTTOM_FN,
+    WAIT_FOR_SELECTOR_FN,
+    cached_driver_path,
+    clear_browser_state,
+    has_class,
+    load_cached_page,
+    load_cached_rows,
+    select_text,
+    store_cached_page,
+    store_cached_rows,
+)
 
-# Clear sys.argv to avoid Jupyter/IPython argument conflicts
+# Keep the command-line arguments for __main__, then clear sys.argv to avoid Jupyter/IPython argument conflicts
+cli_args = sys.argv[1:]
 sys.argv = [sys.argv[0]]
 
-# Set up logging
-log_directory = "logs"
-os.makedirs(log_directory, exist_ok=True)
-log_file = os.path.join(log_directory, f"menu_scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
-class MenuScraper:
-    def __init__(self, headless=True, use_proxy=False, proxy=None):
-        self.use_proxy = use_proxy
-        self.proxy = proxy
-        self.headless = headless
-        self.setup_driver()
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Stylesheets and fonts are blocked in the browser; the scraper only reads the DOM
+BLOCKED_RESOURCE_PATTERNS = ("*.css", "*.css?*", "*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*", "*.otf", "*.otf?*")
+
+# Menu sources for the HTTP scraper. Each page either returns JSON directly
+# or embeds its menu in the Next.js "__NEXT_DATA__" script blob.
+MENU_ENDPOINTS = {
+    "A&W": "https://web.aw.ca/en/our-menu",
+    "McDonald's": "https://www.mcdonalds.com/us/en-us/full-menu.html",
+    "Burger King": "https://www.bk.com/menu",
+}
+NEXT_DATA_PATTERN = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+ITEM_LIST_KEYS = ("items", "menuItems", "products")
+# Fields that only menu items carry; navigation and footer link lists also have
+# names and "items", so a list is only read as a menu when its entries have one of these
+ITEM_EVIDENCE_KEYS = ("price", "prices", "calories", "nutrition", "nutritionalInfo")
+
+# XHR/fetch requests that carry Burger King's menu JSON, captured from Chrome's performance log.
+# The GraphQL endpoint serves every query on the site, so only menu operations are matched there.
+BK_MENU_API_PATTERN = re.compile(r"/api/menu")
+BK_GRAPHQL_PATTERN = re.compile(r"/graphql")
+BK_MENU_OPERATION_PATTERN = re.compile(r'operationName"?\s*[:=]\s*"?\w*menu', re.IGNORECASE)
+# Cache kind for the captured menu JSON
+BK_MENU_CACHE_KIND = "menu.json"
+
+# The shared in-page helpers are combined into the scripts below so a whole page can be
+# handled in one WebDriver round trip.
+# extractMenu builds menu rows inside the browser so only the rows, not the page source,
+# cross the WebDriver wire. It takes a selector config (see the scrape_* methods).
+EXTRACT_MENU_FN = """
+const extractMenu = (config) => {
+    const text = (root, selector) => {
+        const el = selector ? root.querySelector(selector) : null;
+        return el ? el.textContent.trim() : null;
+    };
+    const rows = [];
+    for (const category of document.querySelectorAll(config.category)) {
+        const categoryName = text(category, config.categoryTitle) ?? "Uncategorized";
+        for (const item of category.querySelectorAll(config.item)) {
+            let imageUrl = "";
+            const img = item.querySelector("img");
+            if (img && img.getAttribute("src")) {
+                imageUrl = img.getAttribute("src");
+                if (config.imageBase && imageUrl.startsWith("/")) {
+                    imageUrl = config.imageBase + imageUrl;
+                }
+            }
+            const row = {
+                restaurant: config.restaurant,
+                category: categoryName,
+                name: text(item, config.name) ?? "Unknown",
+                price: text(item, config.price) ?? config.priceDefault,
+                description: text(item, config.description) ?? "",
+                image_url: imageUrl
+            };
+            if (config.nutrition) {
+                const nutritionalInfo = {};
+                const nutrition = item.querySelector(config.nutrition.container);
+                if (nutrition) {
+                    for (const entry of nutrition.querySelectorAll(config.nutrition.item)) {
+                        const key = text(entry, config.nutrition.key);
+                        const value = text(entry, config.nutrition.value);
+                        if (key !== null && value !== null) {
+                            nutritionalInfo[key] = value;
+                        }
+                    }
+                }
+                row.nutritional_info = nutritionalInfo;
+            }
+            rows.push(row);
+        }
+    }
+    return rows;
+};
+"""
+
+# Waits for the menu, scrolls to load all of it and extracts the rows, resolving with
+# null if the menu never appeared. Arguments: selector config, wait timeout in ms,
+# scroll debounce in ms, scroll cap in ms, then the async callback.
+WAIT_AND_EXTRACT_JS = WAIT_FOR_SELECTOR_FN + SCROLL_TO_BOTTOM_FN + EXTRACT_MENU_FN + """
+const [config, timeoutMs, debounceMs, maxWaitMs, done] = arguments;
+waitForSelector(config.category, timeoutMs)
+    .then(found => found ? scrollToBottom(debounceMs, maxWaitMs).then(() => extractMenu(config)) : null)
+    .then(done, () => done(null));
+"""
+
+def is_bk_menu_request(request):
+    """Check whether a request captured from the performance log fetches Burger King's menu"""
+    url = request["url"]
+    if BK_MENU_API_PATTERN.search(url):
+        return True
+    if BK_GRAPHQL_PATTERN.search(url):
+        # The operation name is in the query string for GET requests and in the body for POST
+        return BK_MENU_OPERATION_PATTERN.search(url + request.get("postData", "")) is not None
+    return False
+
+def resolve_restaurant(restaurant_name):
+    """Map a user-supplied restaurant name to its canonical name, or None if unsupported"""
+    restaurant_name = restaurant_name.lower().strip()
+    
+    if "a&w" in restaurant_name or "a & w" in restaurant_name:
+        return "A&W"
+    elif "mcdonald" in restaurant_name:
+        return "McDonald's"
+    elif "burger king" in restaurant_name or "burgerking" in restaurant_name:
+        return "Burger King"
+    return None
+
+def menu_from_body(body, restaurant):
+    """Extract menu rows from a JSON body or a page with embedded menu JSON, or [] if it has none"""
+    try:
+        payload = parse_menu_payload(body)
+    except orjson.JSONDecodeError:
+        return []
+    return extract_menu_items(payload, restaurant) if payload is not None else []
+
+def parse_menu_payload(body):
+    """Load the menu JSON from a JSON body or the __NEXT_DATA__ blob embedded in a page"""
+    if body.lstrip().startswith(("{", "[")):
+        return orjson.loads(body)
+    
+    match = NEXT_DATA_PATTERN.search(body)
+    if match:
+        return orjson.loads(match.group(1))
+    return None
+
+def _item_name(item):
+    """Return the name of a menu item object, or None if it is not a plain string"""
+    name = item.get("name") or item.get("title")
+    return name if isinstance(name, str) and name.strip() else None
+
+def is_menu_item(item):
+    """Check that a JSON object looks like a menu item rather than a link or other named entry"""
+    return (
+        isinstance(item, dict)
+        and _item_name(item) is not None
+        and any(item.get(key) not in (None, "", [], {}) for key in ITEM_EVIDENCE_KEYS)
+    )
+
+def _first_present(mapping, keys, default):
+    """Return the first value under keys that is set, keeping falsy values such as a 0 price"""
+    for key in keys:
+        value = mapping.get(key)
+        if value is not None and value != "":
+            return value
+    return default
+
+def json_item_row(item, restaurant, category):
+    """Convert one menu item object from a JSON payload into a menu row"""
+    price = _first_present(item, ("price",), "N/A")
+    if isinstance(price, dict):
+        price = _first_present(price, ("formatted", "amount", "value"), "N/A")
+    
+    image_url = item.get("image") or item.get("imageUrl") or ""
+    if isinstance(image_url, dict):
+        image_url = image_url.get("url") or image_url.get("src") or ""
+    
+    return {
+        "restaurant": restaurant,
+        "category": category,
+        "name": _item_name(item),
+        "price": str(price),
+        "description": item.get("description") or "",
+        "image_url": image_url
+    }
+
+def extract_menu_items(payload, restaurant):
+    """Walk a menu JSON payload and collect the items listed under named categories"""
+    menu_data = []
+    stack = [payload]
+    
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
         
-    def find_chrome_binary(self):
-        """Find Chrome binary location on various operating systems"""
-        # First check if Chrome is in common locations
-        chrome_paths = [
-            # Linux paths
-            "/usr/bin/google-chrome",
-            "/usr/bin/google-chrome-stable",
-            "/usr/bin/chromium-browser",
-            "/usr/bin/chromium",
-            # Mac paths
-            "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-            # Windows paths
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-        ]
+        category_name = _item_name(node)
+        for key, value in node.items():
+            is_item_list = (
+                key in ITEM_LIST_KEYS
+                and category_name is not None
+                and isinstance(value, list)
+                and any(is_menu_item(item) for item in value)
+            )
+            if is_item_list:
+                for item in value:
+                    if is_menu_item(item):
+                        menu_data.append(json_item_row(item, restaurant, category_name))
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    
+    return menu_data
+
+# CSS selectors for the BeautifulSoup fallback, compiled once and reused for every item
+SEL_HEADING = sv.compile("h2")
+SEL_IMAGE = sv.compile("img")
+SEL_AW_CATEGORY = sv.compile(".menu-category-container")
+SEL_AW_CATEGORY_TITLE = sv.compile(".menu-category-title")
+SEL_AW_ITEM = sv.compile(".menu-item")
+SEL_AW_ITEM_TITLE = sv.compile(".menu-item-title")
+SEL_AW_ITEM_DESCRIPTION = sv.compile(".menu-item-desc")
+SEL_AW_ITEM_PRICE = sv.compile(".menu-item-price")
+SEL_NUTRITION_INFO = sv.compile(".nutrition-info")
+SEL_NUTRITION_ITEM = sv.compile(".nutrition-item")
+SEL_NUTRITION_KEY = sv.compile(".nutrition-key")
+SEL_NUTRITION_VALUE = sv.compile(".nutrition-value")
+SEL_MCD_CATEGORY = sv.compile(".category-wrapper")
+SEL_MCD_ITEM = sv.compile(".cmp-category-item")
+SEL_MCD_ITEM_TITLE = sv.compile(".item-title")
+SEL_MCD_ITEM_PRICE = sv.compile(".item-price")
+SEL_MCD_ITEM_DESCRIPTION = sv.compile(".item-description")
+
+# Only the category containers are built into the fallback parse tree; the rest of
+# the page (navigation, scripts, footers) is skipped as it is parsed
+STRAIN_AW_CATEGORIES = SoupStrainer(attrs={"class": has_class("menu-category-container")})
+STRAIN_MCD_CATEGORIES = SoupStrainer(attrs={"class": has_class("category-wrapper")})
+
+# Columns every menu row has; nutrition_* columns are added only when items carry nutritional_info
+BASE_FIELDS = ("restaurant", "category", "name", "price", "description", "image_url")
+
+def _nutrition_keys(data):
+    """Collect the nutritional_info keys across items, in first-seen order"""
+    return list(dict.fromkeys(
+        key
+        for item in data
+        if isinstance(item.get("nutritional_info"), dict)
+        for key in item["nutritional_info"]
+    ))
+
+def _flatten(item, nutrition_keys):
+    """Build a CSV row for an item, flattening its nutritional_info into the nutrition_* columns"""
+    row = [item.get(field, "") for field in BASE_FIELDS]
+    if nutrition_keys:
+        nutritional_info = item.get("nutritional_info")
+        if not isinstance(nutritional_info, dict):
+            nutritional_info = {}
+        row.extend(nutritional_info.get(key, "") for key in nutrition_keys)
+    return row
+
+# Common Chrome install locations, checked before searching PATH
+CHROME_PATHS = (
+    # Linux paths
+    "/usr/bin/google-chrome",
+    "/usr/bin/google-chrome-stable",
+    "/usr/bin/chromium-browser",
+    "/usr/bin/chromium",
+    # Mac paths
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    # Windows paths
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+)
+CHROME_COMMANDS = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")
+
+@lru_cache(maxsize=1)
+def find_chrome_binary():
+    """Find Chrome binary location on various operating systems (looked up once per process)"""
+    # First check if Chrome is in common locations
+    for path in CHROME_PATHS:
+        if os.path.exists(path):
+            logger.info(f"Found Chrome binary at {path}")
+            return path
+    
+    # If not found, search PATH for the usual command names
+    for name in CHROME_COMMANDS:
+        chrome_path = shutil.which(name)
+        if chrome_path:
+            logger.info(f"Found Chrome binary on PATH at {chrome_path}")
+            return chrome_path
+    
+    logger.warning("Could not find Chrome binary. Using default webdriver configuration.")
+    return None
+
+# lru_cache does not serialize first calls, so pool workers starting browsers at the same
+# time take this lock to resolve Chrome and ChromeDriver (and install ChromeDriver) only once
+DRIVER_SETUP_LOCK = threading.Lock()
+
+@lru_cache(maxsize=1)
+def get_chrome_driver_path():
+    """Resolve the ChromeDriver binary, reusing the path cached on disk for up to a week"""
+    return cached_driver_path("chromedriver_path", lambda: ChromeDriverManager().install())
+
+# Browsers are recycled after this many navigations to bound memory growth on long runs
+MAX_USES = 50
+
+class DriverPool:
+    """Pool of warm WebDriver sessions shared between worker threads"""
+    
+    def __init__(self, factory, size=1, max_uses=MAX_USES):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = queue.Queue(maxsize=size)
+        self._created = 0
+        self._uses = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take an idle driver, creating a new one while the pool is below its size"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        
+        if not can_create:
+            # Every driver is in use, so wait for one to be released
+            return self._idle.get()
         
-        for path in chrome_paths:
-            if os.path.exists(path):
-                logger.info(f"Found Chrome binary at {path}")
-                return path
-                
-        # If not found, try to find via 'which' command on Unix systems
         try:
-            chrome_path = subprocess.check_output(["which", "google-chrome"], text=True).strip()
-            if chrome_path:
-                logger.info(f"Found Chrome binary via 'which' at {chrome_path}")
-                return chrome_path
-        except (subprocess.SubprocessError, FileNotFoundError):
-            try:
-                chrome_path = subprocess.check_output(["which", "google-chrome-stable"], text=True).strip()
-                if chrome_path:
-                    logger.info(f"Found Chrome binary via 'which' at {chrome_path}")
-                    return chrome_path
-            except (subprocess.SubprocessError, FileNotFoundError):
-                pass
+            return self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+    
+    def release(self, driver):
+        """Return a driver to the pool with its state cleared, or quit it once it is worn out"""
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+        if uses >= self.max_uses:
+            logger.info(f"Recycling WebDriver after {uses} uses")
+            self.discard(driver)
+            return
         
-        logger.warning("Could not find Chrome binary. Using default webdriver configuration.")
-        return None
+        try:
+            clear_browser_state(driver)
+        except WebDriverException as e:
+            # The session is broken, so drop it and let acquire() create a replacement
+            logger.warning(f"Discarding broken WebDriver: {str(e)}")
+            self.discard(driver)
+            return
+        self._idle.put(driver)
+    
+    def discard(self, driver):
+        """Quit a driver and free its slot in the pool"""
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        with self._lock:
+            self._created -= 1
+            self._uses.pop(id(driver), None)
+    
+    def close(self):
+        """Quit every idle driver"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(driver)
+        logger.info("Driver pool closed")
+
+class MenuScraper:
+    def __init__(self, headless=True, use_proxy=False, proxy=None, driver=None, pool=None):
+        self.use_proxy = use_proxy
+        self.proxy = proxy
+        self.headless = headless
+        # An injected driver is owned by the caller, and a driver borrowed from a DriverPool
+        # is returned to it by close(); otherwise the driver is created on first use and quit by close()
+        self._driver = driver
+        self._pool = pool
+        self._owns_driver = driver is None and pool is None
+        self._uses = 0
+    
+    @property
+    def driver(self):
+        """WebDriver for this scraper, created (or borrowed from the pool) on first use"""
+        if self._driver is None:
+            if self._pool is not None:
+                self._driver = self._pool.acquire()
+            else:
+                self.setup_driver()
+        return self._driver
         
     def setup_driver(self):
         """Set up the Selenium WebDriver with Chrome"""
+        self._driver = self.build_driver()
+    
+    def navigate(self, url):
+        """Load a page, clearing state from the previous one and recycling the driver every MAX_USES navigations"""
+        if self._driver is not None and self._uses:
+            if self._owns_driver and self._uses >= MAX_USES:
+                logger.info(f"Recycling WebDriver after {self._uses} navigations")
+                self.close()
+                self._uses = 0
+            else:
+                try:
+                    clear_browser_state(self._driver)
+                except WebDriverException as e:
+                    logger.warning(f"Could not clear browser state: {str(e)}")
+        
+        self.driver.get(url)
+        self._uses += 1
+    
+    def build_driver(self):
+        """Create a new Chrome WebDriver with this scraper's options"""
         try:
             chrome_options = Options()
             
-            # Find Chrome binary
-            chrome_binary = self.find_chrome_binary()
+            # Find Chrome binary and ChromeDriver
+            with DRIVER_SETUP_LOCK:
+                chrome_binary = find_chrome_binary()
+                driver_path = get_chrome_driver_path()
             if chrome_binary:
                 chrome_options.binary_location = chrome_binary
             
@@ -104,105 +471,137 @@ class MenuScraper:
             chrome_options.add_argument("--disable-notifications")
             chrome_options.add_argument("--disable-popup-blocking")
             
+            # Skip downloading images; the scraper only reads the DOM, and image URLs
+            # are still available from the src attributes
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2
+            })
+            
             # Add user agent
-            user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            chrome_options.add_argument(f"user-agent={user_agent}")
+            chrome_options.add_argument(f"user-agent={USER_AGENT}")
             
             if self.use_proxy and self.proxy:
                 chrome_options.add_argument(f'--proxy-server={self.proxy}')
             
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            # Record network events so menu API responses can be read back over CDP
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            
+            service = Service(driver_path)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver.execute_cdp_cmd("Network.enable", {})
+            # Chrome has no content setting for stylesheets or fonts, so block them by URL
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(BLOCKED_RESOURCE_PATTERNS)})
             logger.info("WebDriver initialized successfully")
+            return driver
         except Exception as e:
             logger.error(f"Error setting up WebDriver: {str(e)}")
             raise
     
-    def random_delay(self, min_sec=1, max_sec=5):
-        """Add a random delay to mimic human behavior and avoid detection"""
-        delay = random.uniform(min_sec, max_sec)
-        time.sleep(delay)
+    def wait_and_extract(self, selectors, timeout=15, debounce=0.3, max_wait=5.0):
+        """
+        Wait for the menu, scroll to load all content and extract the rows in one async script call
+        
+        Returns None if the menu did not appear within the timeout or no items were found.
+        """
+        try:
+            menu_data = self.driver.execute_async_script(
+                WAIT_AND_EXTRACT_JS,
+                selectors,
+                int(timeout * 1000),
+                int(debounce * 1000),
+                int(max_wait * 1000)
+            )
+        except WebDriverException as e:
+            logger.warning(f"In-browser extraction failed: {str(e)}")
+            return None
+        return menu_data or None
+    
+    def capture_menu_response(self, is_menu_request, restaurant, timeout=15):
+        """
+        Wait for the page to fetch menu JSON in a request accepted by is_menu_request and return (menu_data, body)
+        
+        Matching responses are found in Chrome's performance log and read with CDP Network.getResponseBody.
+        Returns ([], None) if no matching response with menu items arrives within the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        menu_requests = set()
+        pending = set()
+        
+        while time.monotonic() < deadline:
+            for entry in self.driver.get_log("performance"):
+                message = orjson.loads(entry["message"])["message"]
+                params = message.get("params", {})
+                
+                if message["method"] == "Network.requestWillBeSent":
+                    if is_menu_request(params["request"]):
+                        menu_requests.add(params["requestId"])
+                elif message["method"] == "Network.responseReceived":
+                    response = params["response"]
+                    if params["requestId"] in menu_requests and "json" in response.get("mimeType", ""):
+                        pending.add(params["requestId"])
+                elif message["method"] == "Network.loadingFinished" and params.get("requestId") in pending:
+                    pending.discard(params["requestId"])
+                    try:
+                        result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                    except WebDriverException as e:
+                        logger.warning(f"Could not read captured response: {str(e)}")
+                        continue
+                    
+                    try:
+                        body = result["body"]
+                        if result.get("base64Encoded"):
+                            body = base64.b64decode(body).decode("utf-8")
+                        menu_data = extract_menu_items(orjson.loads(body), restaurant)
+                    except (orjson.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    if menu_data:
+                        return menu_data, body
+            
+            time.sleep(0.25)
+        
+        return [], None
     
     def scrape_aw(self):
         """Scrape A&W menu"""
         try:
             logger.info("Starting A&W menu scraping")
             menu_url = "https://web.aw.ca/en/our-menu"
-            self.driver.get(menu_url)
-            
-            # Wait for menu items to load
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".menu-category-container"))
-            )
             
-            # Allow time for dynamic content to load
-            self.random_delay(2, 4)
-            
-            # Scroll down to load all content
-            self.scroll_page()
+            # Reuse recently scraped rows if there are any
+            menu_data = load_cached_rows(menu_url)
+            if menu_data:
+                logger.info(f"Loaded {len(menu_data)} cached A&W menu items")
+                return menu_data
             
-            # Get page source and parse with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            self.navigate(menu_url)
             
-            menu_data = []
+            # Wait for the menu, scroll to load all content and extract it in a single browser call
+            menu_data = self.wait_and_extract({
+                "restaurant": "A&W",
+                "category": ".menu-category-container",
+                "categoryTitle": ".menu-category-title",
+                "item": ".menu-item",
+                "name": ".menu-item-title",
+                "price": ".menu-item-price",
+                "priceDefault": "Price not available online",
+                "description": ".menu-item-desc",
+                "imageBase": "https://web.aw.ca",
+                "nutrition": {
+                    "container": ".nutrition-info",
+                    "item": ".nutrition-item",
+                    "key": ".nutrition-key",
+                    "value": ".nutrition-value"
+                }
+            })
             
-            # Extract menu categories
-            menu_categories = soup.select(".menu-category-container")
-            logger.info(f"Found {len(menu_categories)} menu categories")
+            if menu_data is None:
+                # Fall back to parsing the page source with BeautifulSoup
+                menu_data = self.parse_aw(self.driver.page_source)
             
-            for category in menu_categories:
-                # Get category name
-                category_title_elem = category.select_one(".menu-category-title")
-                category_name = category_title_elem.get_text(strip=True) if category_title_elem else "Uncategorized"
-                logger.info(f"Processing category: {category_name}")
-                
-                # Extract menu items for this category
-                menu_items = category.select(".menu-item")
-                for item in menu_items:
-                    # Extract item name
-                    item_name_elem = item.select_one(".menu-item-title")
-                    item_name = item_name_elem.get_text(strip=True) if item_name_elem else "Unknown"
-                    
-                    # Extract item description
-                    item_desc_elem = item.select_one(".menu-item-desc")
-                    item_description = item_desc_elem.get_text(strip=True) if item_desc_elem else ""
-                    
-                    # Extract price (A&W might not show prices directly on the menu page)
-                    item_price_elem = item.select_one(".menu-item-price")
-                    item_price = item_price_elem.get_text(strip=True) if item_price_elem else "Price not available online"
-                    
-                    # Extract image URL if available
-                    item_image = ""
-                    img_tag = item.select_one("img")
-                    if img_tag and img_tag.get('src'):
-                        item_image = img_tag.get('src')
-                        
-                        # If it's a relative URL, make it absolute
-                        if item_image.startswith('/'):
-                            item_image = f"https://web.aw.ca{item_image}"
-                    
-                    # Add nutritional info if available
-                    nutritional_info = {}
-                    nutrition_elem = item.select_one(".nutrition-info")
-                    if nutrition_elem:
-                        nutrition_items = nutrition_elem.select(".nutrition-item")
-                        for n_item in nutrition_items:
-                            key_elem = n_item.select_one(".nutrition-key")
-                            value_elem = n_item.select_one(".nutrition-value")
-                            if key_elem and value_elem:
-                                key = key_elem.get_text(strip=True)
-                                value = value_elem.get_text(strip=True)
-                                nutritional_info[key] = value
-                    
-                    menu_data.append({
-                        "restaurant": "A&W",
-                        "category": category_name,
-                        "name": item_name,
-                        "price": item_price,
-                        "description": item_description,
-                        "image_url": item_image,
-                        "nutritional_info": nutritional_info
-                    })
+            # Cache the rows so retries and later runs can skip the browser
+            if menu_data:
+                store_cached_rows(menu_url, menu_data)
             
             logger.info(f"Scraped {len(menu_data)} items from A&W menu")
             return menu_data
@@ -210,115 +609,182 @@ class MenuScraper:
             logger.error(f"Error scraping A&W menu: {str(e)}")
             return []
     
+    @staticmethod
+    def parse_aw(page_source):
+        """Parse A&W menu items from the page source with BeautifulSoup"""
+        soup = BeautifulSoup(page_source, 'lxml', parse_only=STRAIN_AW_CATEGORIES)
+        
+        menu_data = []
+        
+        # Extract menu categories
+        menu_categories = SEL_AW_CATEGORY.select(soup)
+        logger.info(f"Found {len(menu_categories)} menu categories")
+        
+        for category in menu_categories:
+            # Get category name
+            category_name = select_text(category, SEL_AW_CATEGORY_TITLE, "Uncategorized")
+            logger.debug(f"Processing category: {category_name}")
+            
+            # Extract menu items for this category
+            menu_items = SEL_AW_ITEM.select(category)
+            for item in menu_items:
+                # Extract item name
+                item_name = select_text(item, SEL_AW_ITEM_TITLE, "Unknown")
+                
+                # Extract item description
+                item_description = select_text(item, SEL_AW_ITEM_DESCRIPTION, "")
+                
+                # Extract price (A&W might not show prices directly on the menu page)
+                item_price = select_text(item, SEL_AW_ITEM_PRICE, "Price not available online")
+                
+                # Extract image URL if available
+                item_image = ""
+                img_tag = SEL_IMAGE.select_one(item)
+                if img_tag and img_tag.get('src'):
+                    item_image = img_tag.get('src')
+                    
+                    # If it's a relative URL, make it absolute
+                    if item_image.startswith('/'):
+                        item_image = f"https://web.aw.ca{item_image}"
+                
+                # Add nutritional info if available
+                nutritional_info = {}
+                nutrition_elem = SEL_NUTRITION_INFO.select_one(item)
+                if nutrition_elem:
+                    nutrition_items = SEL_NUTRITION_ITEM.select(nutrition_elem)
+                    for n_item in nutrition_items:
+                        key_elem = SEL_NUTRITION_KEY.select_one(n_item)
+                        value_elem = SEL_NUTRITION_VALUE.select_one(n_item)
+                        if key_elem and value_elem:
+                            key = key_elem.get_text(strip=True)
+                            value = value_elem.get_text(strip=True)
+                            nutritional_info[key] = value
+                
+                menu_data.append({
+                    "restaurant": "A&W",
+                    "category": category_name,
+                    "name": item_name,
+                    "price": item_price,
+                    "description": item_description,
+                    "image_url": item_image,
+                    "nutritional_info": nutritional_info
+                })
+        
+        return menu_data
+    
     def scrape_mcdonalds(self):
         """Scrape McDonald's menu"""
         try:
             logger.info("Starting McDonald's menu scraping")
             menu_url = "https://www.mcdonalds.com/us/en-us/full-menu.html"
-            self.driver.get(menu_url)
-            
-            # Wait for menu items to load
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".category-wrapper"))
-            )
             
-            # Allow time for dynamic content to load
-            self.random_delay(2, 4)
-            
-            # Scroll down to load all content
-            self.scroll_page()
+            # Reuse recently scraped rows if there are any
+            menu_data = load_cached_rows(menu_url)
+            if menu_data:
+                logger.info(f"Loaded {len(menu_data)} cached McDonald's menu items")
+                return menu_data
             
-            # Get page source and parse with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            self.navigate(menu_url)
             
-            menu_data = []
+            # Wait for the menu, scroll to load all content and extract it in a single browser call
+            menu_data = self.wait_and_extract({
+                "restaurant": "McDonald's",
+                "category": ".category-wrapper",
+                "categoryTitle": "h2",
+                "item": ".cmp-category-item",
+                "name": ".item-title",
+                "price": ".item-price",
+                "priceDefault": "N/A",
+                "description": ".item-description"
+            })
             
-            # Extract menu categories
-            menu_categories = soup.select(".category-wrapper")
-            logger.info(f"Found {len(menu_categories)} menu categories")
+            if menu_data is None:
+                # Fall back to parsing the page source with BeautifulSoup
+                menu_data = self.parse_mcdonalds(self.driver.page_source)
             
-            for category in menu_categories:
-                category_name = category.select_one("h2").get_text(strip=True) if category.select_one("h2") else "Uncategorized"
-                logger.info(f"Processing category: {category_name}")
-                
-                # Extract menu items for this category
-                menu_items = category.select(".cmp-category-item")
-                for item in menu_items:
-                    item_name = item.select_one(".item-title").get_text(strip=True) if item.select_one(".item-title") else "Unknown"
-                    item_price = item.select_one(".item-price").get_text(strip=True) if item.select_one(".item-price") else "N/A"
-                    item_description = item.select_one(".item-description").get_text(strip=True) if item.select_one(".item-description") else ""
-                    item_image = ""
-                    
-                    img_tag = item.select_one("img")
-                    if img_tag and img_tag.get('src'):
-                        item_image = img_tag.get('src')
-                    
-                    menu_data.append({
-                        "restaurant": "McDonald's",
-                        "category": category_name,
-                        "name": item_name,
-                        "price": item_price,
-                        "description": item_description,
-                        "image_url": item_image
-                    })
+            # Cache the rows so retries and later runs can skip the browser
+            if menu_data:
+                store_cached_rows(menu_url, menu_data)
             
             logger.info(f"Scraped {len(menu_data)} items from McDonald's menu")
             return menu_data
         except Exception as e:
             logger.error(f"Error scraping McDonald's menu: {str(e)}")
             return []
+    
+    @staticmethod
+    def parse_mcdonalds(page_source):
+        """Parse McDonald's menu items from the page source with BeautifulSoup"""
+        soup = BeautifulSoup(page_source, 'lxml', parse_only=STRAIN_MCD_CATEGORIES)
+        
+        menu_data = []
+        
+        # Extract menu categories
+        menu_categories = SEL_MCD_CATEGORY.select(soup)
+        logger.info(f"Found {len(menu_categories)} menu categories")
+        
+        for category in menu_categories:
+            category_name = select_text(category, SEL_HEADING, "Uncategorized")
+            logger.debug(f"Processing category: {category_name}")
+            
+            # Extract menu items for this category
+            menu_items = SEL_MCD_ITEM.select(category)
+            for item in menu_items:
+                item_name = select_text(item, SEL_MCD_ITEM_TITLE, "Unknown")
+                item_price = select_text(item, SEL_MCD_ITEM_PRICE, "N/A")
+                item_description = select_text(item, SEL_MCD_ITEM_DESCRIPTION, "")
+                item_image = ""
+                
+                img_tag = SEL_IMAGE.select_one(item)
+                if img_tag and img_tag.get('src'):
+                    item_image = img_tag.get('src')
+                
+                menu_data.append({
+                    "restaurant": "McDonald's",
+                    "category": category_name,
+                    "name": item_name,
+                    "price": item_price,
+                    "description": item_description,
+                    "image_url": item_image
+                })
+        
+        return menu_data
 
     def scrape_burger_king(self):
-        """Scrape Burger King menu"""
+        """Scrape Burger King menu from the menu JSON the page loads, falling back to the rendered menu"""
         try:
             logger.info("Starting Burger King menu scraping")
             menu_url = "https://www.bk.com/menu"
-            self.driver.get(menu_url)
-            
-            # Wait for menu items to load
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".menuPage_menuCategory__Qbda1"))
-            )
-            
-            # Allow time for dynamic content to load
-            self.random_delay(2, 4)
-            
-            # Scroll down to load all content
-            self.scroll_page()
             
-            # Get page source and parse with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            menu_data = []
+            # Reuse a recently captured copy of the menu JSON if there is one. It is kept apart
+            # from the page body the HTTP scraper caches for the same URL.
+            cached_body = load_cached_page(menu_url, kind=BK_MENU_CACHE_KIND)
+            menu_data = menu_from_body(cached_body, "Burger King") if cached_body is not None else []
+            if menu_data:
+                logger.info(f"Parsed {len(menu_data)} items from the cached Burger King menu")
+                return menu_data
             
-            # Extract menu categories
-            menu_categories = soup.select(".menuPage_menuCategory__Qbda1")
-            logger.info(f"Found {len(menu_categories)} menu categories")
+            # Drop network events from earlier pages so only this page's responses are matched
+            self.driver.get_log("performance")
+            self.navigate(menu_url)
             
-            for category in menu_categories:
-                category_name = category.select_one("h2").get_text(strip=True) if category.select_one("h2") else "Uncategorized"
-                logger.info(f"Processing category: {category_name}")
-                
-                # Extract menu items for this category
-                menu_items = category.select(".menuItem_wrapper__X_zY_")
-                for item in menu_items:
-                    item_name = item.select_one(".menuItem_name__on_cM").get_text(strip=True) if item.select_one(".menuItem_name__on_cM") else "Unknown"
-                    item_price = item.select_one(".menuItem_price__TPsSC").get_text(strip=True) if item.select_one(".menuItem_price__TPsSC") else "N/A"
-                    item_description = item.select_one(".menuItem_description__i5zkV").get_text(strip=True) if item.select_one(".menuItem_description__i5zkV") else ""
-                    item_image = ""
-                    
-                    img_tag = item.select_one("img")
-                    if img_tag and img_tag.get('src'):
-                        item_image = img_tag.get('src')
-                    
-                    menu_data.append({
-                        "restaurant": "Burger King",
-                        "category": category_name,
-                        "name": item_name,
-                        "price": item_price,
-                        "description": item_description,
-                        "image_url": item_image
-                    })
+            # Read the menu JSON as the page fetches it, without waiting for it to render
+            menu_data, body = self.capture_menu_response(is_bk_menu_request, "Burger King")
+            if menu_data:
+                store_cached_page(menu_url, body, kind=BK_MENU_CACHE_KIND)
+            else:
+                # Fall back to extracting the rendered menu inside the browser
+                logger.info("No Burger King menu JSON captured, reading the rendered menu")
+                menu_data = self.wait_and_extract({
+                    "restaurant": "Burger King",
+                    "category": ".menuPage_menuCategory__Qbda1",
+                    "categoryTitle": "h2",
+                    "item": ".menuItem_wrapper__X_zY_",
+                    "name": ".menuItem_name__on_cM",
+                    "price": ".menuItem_price__TPsSC",
+                    "priceDefault": "N/A",
+                    "description": ".menuItem_description__i5zkV"
+                }) or []
             
             logger.info(f"Scraped {len(menu_data)} items from Burger King menu")
             return menu_data
@@ -326,93 +792,199 @@ class MenuScraper:
             logger.error(f"Error scraping Burger King menu: {str(e)}")
             return []
     
-    def scroll_page(self, pause_time=1.0):
-        """Scroll down the page to ensure all dynamic content is loaded"""
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
-        
-        while True:
-            # Scroll down to bottom
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            
-            # Wait to load page
-            time.sleep(pause_time)
-            
-            # Calculate new scroll height and compare with last scroll height
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
-
-    def save_as_json(self, data, filename):
+    @staticmethod
+    def save_as_json(data, filename):
         """Save data as JSON file"""
         try:
-            with open(filename, 'w', encoding='utf-8') as json_file:
-                json.dump(data, json_file, indent=4, ensure_ascii=False)
+            with open(filename, 'wb') as json_file:
+                json_file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             logger.info(f"Data successfully saved to {filename}")
             return True
         except Exception as e:
             logger.error(f"Error saving JSON file: {str(e)}")
             return False
     
-    def save_as_csv(self, data, filename):
+    @staticmethod
+    def save_as_csv(data, filename):
         """Save data as CSV file"""
         try:
             if not data:
                 logger.warning("No data to save to CSV")
                 return False
                 
-            # For CSV, we need to flatten the nutritional_info dictionary if it exists
-            flattened_data = []
-            for item in data:
-                flat_item = item.copy()
-                
-                # Handle nutritional_info if it exists
-                if "nutritional_info" in flat_item and isinstance(flat_item["nutritional_info"], dict):
-                    for key, value in flat_item["nutritional_info"].items():
-                        flat_item[f"nutrition_{key}"] = value
-                    del flat_item["nutritional_info"]
-                
-                flattened_data.append(flat_item)
-            
-            # Extract column headers from all items to ensure we include all possible fields
-            all_fields = set()
-            for item in flattened_data:
-                all_fields.update(item.keys())
-            
-            fieldnames = sorted(list(all_fields))
+            nutrition_keys = _nutrition_keys(data)
+            fieldnames = list(BASE_FIELDS) + [f"nutrition_{key}" for key in nutrition_keys]
             
             with open(filename, 'w', newline='', encoding='utf-8') as csv_file:
-                writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(flattened_data)
+                writer = csv.writer(csv_file)
+                writer.writerow(fieldnames)
+                writer.writerows(_flatten(item, nutrition_keys) for item in data)
             logger.info(f"Data successfully saved to {filename}")
             return True
         except Exception as e:
             logger.error(f"Error saving CSV file: {str(e)}")
             return False
     
+    @staticmethod
+    def save_both(data, output_base):
+        """Save data as JSON and CSV files in a single pass over the items"""
+        json_filename = f"{output_base}_menu.json"
+        csv_filename = f"{output_base}_menu.csv"
+        try:
+            if not data:
+                logger.warning("No data to save")
+                return False
+            
+            nutrition_keys = _nutrition_keys(data)
+            fieldnames = list(BASE_FIELDS) + [f"nutrition_{key}" for key in nutrition_keys]
+            
+            with open(json_filename, 'wb') as json_file, open(csv_filename, 'w', newline='', encoding='utf-8') as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(fieldnames)
+                
+                # Stream the JSON array one item at a time, indented to match save_as_json
+                json_file.write(b"[\n")
+                for i, item in enumerate(data):
+                    if i:
+                        json_file.write(b",\n")
+                    encoded = orjson.dumps(item, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                    json_file.write(b"  " + encoded.replace(b"\n", b"\n  "))
+                    writer.writerow(_flatten(item, nutrition_keys))
+                json_file.write(b"\n]")
+            
+            logger.info(f"Data successfully saved to {json_filename} and {csv_filename}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving menu files: {str(e)}")
+            return False
+    
     def scrape_restaurant(self, restaurant_name):
         """Scrape menu based on restaurant name"""
-        restaurant_name = restaurant_name.lower().strip()
+        restaurant = resolve_restaurant(restaurant_name)
         
-        if "a&w" in restaurant_name or "a & w" in restaurant_name:
+        if restaurant == "A&W":
             return self.scrape_aw()
-        elif "mcdonald" in restaurant_name:
+        elif restaurant == "McDonald's":
             return self.scrape_mcdonalds()
-        elif "burger king" in restaurant_name or "burgerking" in restaurant_name:
+        elif restaurant == "Burger King":
             return self.scrape_burger_king()
         else:
             logger.error(f"Unsupported restaurant: {restaurant_name}")
             return []
     
     def close(self):
-        """Close the WebDriver"""
-        if hasattr(self, 'driver'):
-            self.driver.quit()
-            logger.info("WebDriver closed")
+        """Close the WebDriver, or return it to the pool it was borrowed from"""
+        if self._driver is not None:
+            if self._owns_driver:
+                self._driver.quit()
+                logger.info("WebDriver closed")
+            elif self._pool is not None:
+                self._pool.release(self._driver)
+        self._driver = None
+
+class AsyncMenuScraper:
+    """Scrape menus from their JSON sources over HTTP, without starting a browser"""
+    
+    def __init__(self, max_concurrency=5, timeout=15, proxy=None):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        # Chrome accepts a bare host:port proxy, but httpx needs the scheme
+        if proxy and "://" not in proxy:
+            proxy = f"http://{proxy}"
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=timeout,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            proxy=proxy
+        )
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+    
+    async def fetch(self, url):
+        """Fetch a URL, returning the response or None if it is not a 200"""
+        async with self.semaphore:
+            try:
+                response = await self.client.get(url)
+            except httpx.HTTPError as e:
+                logger.warning(f"Error fetching {url}: {str(e)}")
+                return None
+        
+        if response.status_code != 200:
+            logger.warning(f"Got HTTP {response.status_code} from {url}")
+            return None
+        return response
+    
+    async def scrape_restaurant(self, restaurant_name):
+        """
+        Scrape menu based on restaurant name
+        
+        Returns None when no menu could be read over HTTP, so the caller can fall back to Selenium.
+        """
+        restaurant = resolve_restaurant(restaurant_name)
+        if restaurant is None:
+            logger.error(f"Unsupported restaurant: {restaurant_name}")
+            return []
+        
+        try:
+            menu_url = MENU_ENDPOINTS[restaurant]
+            
+            # Reuse a recently fetched copy of the page if it has the menu in it
+            body = load_cached_page(menu_url)
+            menu_data = menu_from_body(body, restaurant) if body is not None else []
+            if menu_data:
+                logger.info(f"Parsed {len(menu_data)} items from the cached {restaurant} menu")
+                return menu_data
+            
+            logger.info(f"Fetching {restaurant} menu over HTTP")
+            response = await self.fetch(menu_url)
+            if response is None:
+                return None
+            body = response.text
+            
+            menu_data = menu_from_body(body, restaurant)
+            if not menu_data:
+                logger.warning(f"No menu JSON found for {restaurant}")
+                return None
+            
+            store_cached_page(menu_url, body)
+            logger.info(f"Scraped {len(menu_data)} items from {restaurant} menu over HTTP")
+            return menu_data
+        except Exception as e:
+            logger.error(f"Error fetching {restaurant} menu over HTTP: {str(e)}")
+            return None
+
+def _scrape_one(restaurant, pool):
+    """Scrape one restaurant with a driver borrowed from the pool (runs in a worker thread)"""
+    # The driver is only borrowed once the scraper navigates, so menus served from the
+    # page cache never start a browser
+    scraper = MenuScraper(pool=pool)
+    try:
+        return scraper.scrape_restaurant(restaurant)
+    finally:
+        scraper.close()
+
+async def scrape_all_async(restaurants, max_concurrency=5, proxy=None):
+    """Scrape all restaurants concurrently over HTTP"""
+    async with AsyncMenuScraper(max_concurrency=max_concurrency, proxy=proxy) as scraper:
+        return await asyncio.gather(*[scraper.scrape_restaurant(r) for r in restaurants])
+
+def run_async(coro):
+    """Run a coroutine to completion, even when called from inside Jupyter's event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    # A loop is already running (e.g. in a notebook), so run ours on a worker thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
 
 # Function to run scraper with parameters (for Jupyter usage)
-def run_scraper(restaurants=None, output_dir="menu_data", headless=True, proxy=None):
+def run_scraper(restaurants=None, output_dir="menu_data", headless=True, proxy=None, concurrency=None):
     """
     Run the scraper with the specified parameters
     
@@ -421,6 +993,8 @@ def run_scraper(restaurants=None, output_dir="menu_data", headless=True, proxy=N
         output_dir (str): Directory to save output files. Default: "menu_data"
         headless (bool): Whether to run in headless mode. Default: True
         proxy (str): Proxy server to use. Default: None
+        concurrency (int): Maximum number of restaurants scraped at once. Default: 5 HTTP fetches,
+            then one browser per CPU for the Selenium fallback
     """
     if restaurants is None:
         restaurants = ["A&W", "McDonalds", "Burger King"]
@@ -428,30 +1002,48 @@ def run_scraper(restaurants=None, output_dir="menu_data", headless=True, proxy=N
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
     
-    # Setup for using a proxy if specified
-    use_proxy = proxy is not None
-    
-    # Initialize the scraper
-    scraper = MenuScraper(
-        headless=headless,
-        use_proxy=use_proxy,
-        proxy=proxy
-    )
-    
     try:
         all_menu_data = []
         
-        for restaurant in restaurants:
+        # Fetch all menus concurrently over HTTP first
+        results = run_async(scrape_all_async(restaurants, max_concurrency=concurrency or 5, proxy=proxy))
+        
+        # Scrape the menus not available over HTTP in parallel, sharing a pool of warm browsers
+        fallback = [i for i, menu_data in enumerate(results) if menu_data is None]
+        if fallback:
+            max_workers = min(len(fallback), concurrency or os.cpu_count() or 1)
+            logger.info(f"Falling back to Selenium for {len(fallback)} restaurants with {max_workers} workers")
+            driver_factory = MenuScraper(
+                headless=headless,
+                use_proxy=proxy is not None,
+                proxy=proxy
+            ).build_driver
+            pool = DriverPool(driver_factory, size=max_workers)
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(_scrape_one, restaurants[i], pool): i
+                        for i in fallback
+                    }
+                    for future in as_completed(futures):
+                        i = futures[future]
+                        try:
+                            results[i] = future.result()
+                        except Exception as e:
+                            logger.error(f"Error scraping {restaurants[i]} menu: {str(e)}")
+                            results[i] = []
+            finally:
+                pool.close()
+        
+        for restaurant, menu_data in zip(restaurants, results):
             logger.info(f"Processing {restaurant} menu")
-            menu_data = scraper.scrape_restaurant(restaurant)
             
             if menu_data:
                 # Save individual restaurant data
                 restaurant_name = restaurant.lower().replace(" ", "_").replace("&", "and")
                 output_base = os.path.join(output_dir, restaurant_name)
                 
-                scraper.save_as_json(menu_data, f"{output_base}_menu.json")
-                scraper.save_as_csv(menu_data, f"{output_base}_menu.csv")
+                MenuScraper.save_both(menu_data, output_base)
                 
                 # Add to combined data
                 all_menu_data.extend(menu_data)
@@ -459,12 +1051,27 @@ def run_scraper(restaurants=None, output_dir="menu_data", headless=True, proxy=N
         # Save combined data if more than one restaurant was scraped
         if len(restaurants) > 1 and all_menu_data:
             output_base = os.path.join(output_dir, "all_restaurants")
-            scraper.save_as_json(all_menu_data, f"{output_base}_menu.json")
-            scraper.save_as_csv(all_menu_data, f"{output_base}_menu.csv")
+            MenuScraper.save_both(all_menu_data, output_base)
             
         return True
     except Exception as e:
         logger.error(f"Error in execution: {str(e)}")
         return False
-    finally:
-        scraper.close()
\ No newline at end of file
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape restaurant menus")
+    parser.add_argument("--restaurants", nargs="+", default=None, help="Restaurants to scrape")
+    parser.add_argument("--output-dir", default="menu_data", help="Directory to save output files")
+    parser.add_argument("--no-headless", action="store_true", help="Show the browser window")
+    parser.add_argument("--proxy", default=None, help="Proxy server to use")
+    parser.add_argument("--concurrency", type=int, default=None, help="Maximum number of restaurants scraped at once (default: 5 over HTTP, one browser per CPU)")
+    # parse_known_args ignores the extra arguments passed by Jupyter/IPython kernels
+    args, _ = parser.parse_known_args(cli_args)
+    
+    run_scraper(
+        restaurants=args.restaurants,
+        output_dir=args.output_dir,
+        headless=not args.no_headless,
+        proxy=args.proxy,
+        concurrency=args.concurrency
+    )
@@ -0,0 +1,177 @@
+"""Helpers shared by the Chrome and Firefox menu scrapers"""
+import os
+import time
+import queue
+import atexit
+import hashlib
+import logging
+import logging.handlers
+from datetime import datetime
+import orjson
+
+# Set up logging
+log_directory = "logs"
+os.makedirs(log_directory, exist_ok=True)
+log_file = os.path.join(log_directory, f"menu_scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+
+# Log calls only enqueue records; a background listener thread does the file and console I/O
+log_queue = queue.Queue(-1)
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.handlers.QueueHandler(log_queue)]
+)
+log_listener = logging.handlers.QueueListener(
+    log_queue,
+    logging.FileHandler(log_file),
+    logging.StreamHandler()
+)
+log_listener.start()
+atexit.register(log_listener.stop)
+logger = logging.getLogger(__name__)
+
+# Resolved driver paths are cached on disk so WebDriver Manager's network check
+# only runs about once a week, and runs work offline once a driver is installed
+DRIVER_PATH_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "menu_scraper")
+DRIVER_PATH_MAX_AGE = 7 * 24 * 60 * 60
+
+def cached_driver_path(name, install):
+    """Return the driver path cached on disk under name if it is under a week old, otherwise install() one and cache it"""
+    cache_file = os.path.join(DRIVER_PATH_CACHE_DIR, name)
+    try:
+        if time.time() - os.path.getmtime(cache_file) < DRIVER_PATH_MAX_AGE:
+            with open(cache_file, encoding='utf-8') as f:
+                driver_path = f.read().strip()
+            if os.path.exists(driver_path):
+                return driver_path
+    except OSError:
+        pass
+    
+    driver_path = install()
+    try:
+        os.makedirs(DRIVER_PATH_CACHE_DIR, exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            f.write(driver_path)
+    except OSError as e:
+        logger.warning(f"Could not cache driver path: {str(e)}")
+    return driver_path
+
+# Fetched pages and scraped menus are cached on disk, keyed by URL, so retries and repeated
+# runs within the hour can skip the network and the browser. Each kind of content (raw
+# page body, extracted menu rows, captured JSON) has its own file so one never shadows another.
+PAGE_CACHE_DIR = "cache"
+PAGE_CACHE_MAX_AGE = 60 * 60
+
+def page_cache_path(url, kind="html"):
+    """Path of the cached copy of a page's content of the given kind"""
+    return os.path.join(PAGE_CACHE_DIR, f"{hashlib.blake2b(url.encode(), digest_size=16).hexdigest()}.{kind}")
+
+def load_cached_page(url, max_age=PAGE_CACHE_MAX_AGE, kind="html"):
+    """Return the cached content for url if it is younger than max_age seconds, otherwise None"""
+    cache_path = page_cache_path(url, kind)
+    try:
+        if time.time() - os.path.getmtime(cache_path) < max_age:
+            with open(cache_path, encoding='utf-8') as f:
+                return f.read()
+    except OSError:
+        pass
+    return None
+
+def store_cached_page(url, content, kind="html"):
+    """Write content for url to the cache"""
+    try:
+        os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+        with open(page_cache_path(url, kind), 'w', encoding='utf-8') as f:
+            f.write(content)
+    except OSError as e:
+        logger.warning(f"Could not cache page {url}: {str(e)}")
+
+def load_cached_rows(url, max_age=PAGE_CACHE_MAX_AGE):
+    """Return the menu rows cached for url if they are younger than max_age seconds, otherwise None"""
+    cached = load_cached_page(url, max_age, kind="rows.json")
+    if cached is None:
+        return None
+    try:
+        return orjson.loads(cached)
+    except orjson.JSONDecodeError:
+        return None
+
+def store_cached_rows(url, menu_data):
+    """Write scraped menu rows to the cache"""
+    store_cached_page(url, orjson.dumps(menu_data).decode(), kind="rows.json")
+
+# In-page helpers, combined into each scraper's scripts so a whole page can be handled
+# in one WebDriver round trip.
+# waitForSelector resolves true once the selector matches, or false after the timeout.
+WAIT_FOR_SELECTOR_FN = """
+const waitForSelector = (selector, timeoutMs) => new Promise(resolve => {
+    if (document.querySelector(selector)) {
+        resolve(true);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        if (document.querySelector(selector)) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(true);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        resolve(false);
+    }, timeoutMs);
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+});
+"""
+
+# scrollToBottom scrolls until lazy-loaded content stops arriving: it resolves once the
+# page height is unchanged after a debounce with no DOM mutations, or after a hard cap.
+SCROLL_TO_BOTTOM_FN = """
+const scrollToBottom = (debounceMs, maxWaitMs) => new Promise(resolve => {
+    let lastHeight = document.body.scrollHeight;
+    let settleTimer = null;
+    let finished = false;
+    const observer = new MutationObserver(() => settle());
+    const finish = () => {
+        if (finished) return;
+        finished = true;
+        observer.disconnect();
+        clearTimeout(settleTimer);
+        clearTimeout(capTimer);
+        resolve(document.body.scrollHeight);
+    };
+    const settle = () => {
+        clearTimeout(settleTimer);
+        settleTimer = setTimeout(() => {
+            const height = document.body.scrollHeight;
+            if (height === lastHeight) {
+                finish();
+                return;
+            }
+            lastHeight = height;
+            window.scrollTo(0, height);
+            settle();
+        }, debounceMs);
+    };
+    const capTimer = setTimeout(finish, maxWaitMs);
+    observer.observe(document.body, {childList: true, subtree: true});
+    window.scrollTo(0, lastHeight);
+    settle();
+});
+"""
+
+def has_class(class_name):
+    """Match a class attribute containing class_name, for SoupStrainer (which sees the raw attribute string)"""
+    return lambda value: isinstance(value, str) and class_name in value.split()
+
+def select_text(node, selector, default):
+    """Return the stripped text of the first match for a compiled selector under node, or default if none"""
+    match = selector.select_one(node)
+    return match.get_text(strip=True) if match else default
+
+def clear_browser_state(driver):
+    """Drop cookies and web storage left behind by the previous page"""
+    driver.delete_all_cookies()
+    driver.execute_script(
+        "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+    )